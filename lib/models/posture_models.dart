@@ -23,8 +23,8 @@ class PostureResult {
 
   factory PostureResult.fromJson(Map<String, dynamic> json) {
     return PostureResult(
-      timestamp: DateTime.fromMillisecondsSinceEpoch(
-        (json['timestamp'] * 1000).round(),
+      timestamp: DateTime.fromMicrosecondsSinceEpoch(
+        (json['timestamp'] as int) ~/ 1000,
       ),
       isLeaning: json['is_leaning'] ?? false,
       posture: json['posture'] ?? 'unknown',
@@ -61,8 +61,8 @@ class PostureError {
 
   factory PostureError.fromJson(Map<String, dynamic> json) {
     return PostureError(
-      timestamp: DateTime.fromMillisecondsSinceEpoch(
-        (json['timestamp'] * 1000).round(),
+      timestamp: DateTime.fromMicrosecondsSinceEpoch(
+        (json['timestamp'] as int) ~/ 1000,
       ),
       message: json['message'] ?? 'Unknown error',
       type: json['type'] ?? 'error',
@@ -98,8 +98,8 @@ class PostureStatus {
 
   factory PostureStatus.fromJson(Map<String, dynamic> json) {
     return PostureStatus(
-      timestamp: DateTime.fromMillisecondsSinceEpoch(
-        (json['timestamp'] * 1000).round(),
+      timestamp: DateTime.fromMicrosecondsSinceEpoch(
+        (json['timestamp'] as int) ~/ 1000,
       ),
       message: json['message'] ?? 'Unknown status',
       type: json['type'] ?? 'status',
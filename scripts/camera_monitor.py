@@ -18,11 +18,76 @@ Usage Example:
         print(f"Camera error: {e}")
 """
 
+import re
 import cv2
+import sys
+import numpy as np
 import time
+import logging
+from collections import deque
 from threading import Lock, Thread, Event
+from weakref import WeakValueDictionary
 from posture_detector import PostureDetector
 
+__all__ = ["CameraMonitor"]
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on frames a driver may have queued (V4L2 default ring depth)
+MAX_BUFFERED_FRAMES = 4
+# A grab slower than this waited on the sensor, so the queue is empty
+FRESH_GRAB_SECONDS = 0.015
+# Requested capture resolution; posture only needs coarse landmarks
+CAPTURE_WIDTH = 640
+CAPTURE_HEIGHT = 480
+# Frames wider than this are downscaled (keeping aspect ratio) before detection
+DETECTION_WIDTH = 320
+# Linux pipeline whose appsink keeps only the newest frame, whatever the driver does
+GSTREAMER_PIPELINE = (
+    "v4l2src device=/dev/video{index} ! video/x-raw,width={width},height={height},framerate=15/1"
+    " ! videoconvert ! appsink max-buffers=1 drop=true sync=false"
+)
+# How long a measurement waits for the capture thread to publish a frame
+FRAME_TIMEOUT_SECONDS = 5.0
+# Number of recent per-stage timings kept for stats()
+STATS_WINDOW = 128
+
+_build_info_logged = False
+
+
+def _log_opencv_build():
+    """Log the SIMD baseline and dispatch targets OpenCV was built with, once per process."""
+    global _build_info_logged
+    if _build_info_logged:
+        return
+    _build_info_logged = True
+    info = cv2.getBuildInformation()
+
+    def field(name):
+        match = re.search(rf"^\s*{name}:\s*(.*)$", info, re.MULTILINE)
+        return match.group(1).strip() if match else "unknown"
+
+    logger.info(
+        "OpenCV %s (optimized=%s): CPU baseline [%s], dispatched [%s], parallel framework [%s]",
+        cv2.__version__,
+        cv2.useOptimized(),
+        field("Baseline"),
+        field("Dispatched code generation"),
+        field("Parallel framework"),
+    )
+
+
+def _percentiles_ms(samples_ns):
+    """Return the p50 and p95 of nanosecond samples, in milliseconds."""
+    if not samples_ns:
+        return {"p50": None, "p95": None}
+    ordered = sorted(samples_ns)
+    last = len(ordered) - 1
+    return {
+        "p50": round(ordered[last * 50 // 100] / 1e6, 3),
+        "p95": round(ordered[last * 95 // 100] / 1e6, 3),
+    }
+
 
 class CameraMonitor:
     """
@@ -30,7 +95,13 @@ class CameraMonitor:
     and yielding the leaning state (True/False) as a stream.
     """
 
-    def __init__(self, interval=10.0, camera_index=0, sensitivity=0.4):
+    # Detectors are shared by monitors of the same camera with the same settings
+    # so the MediaPipe models load once per process; entries go away with their
+    # last monitor. Keying on the camera keeps landmark tracking per stream.
+    _detector_cache = WeakValueDictionary()
+    _detector_cache_lock = Lock()
+
+    def __init__(self, interval=10.0, camera_index=0, sensitivity=0.4, model_complexity=1):
         """
         Initialize the CameraMonitor.
 
@@ -38,16 +109,71 @@ class CameraMonitor:
             interval (float): Time between captures in seconds.
             camera_index (int): Index of the camera to use (default is 0 for built-in webcam).
             sensitivity (float): Sensitivity for posture detection (default is 0.4).
+            model_complexity (int): MediaPipe pose model, 0 (lite) to 2 (heavy) (default is 1).
         """
+        _log_opencv_build()
         self.interval = interval
         self.camera_index = camera_index
-        self.detector = PostureDetector(sensitivity=sensitivity)
+        self.detector = self._get_detector(camera_index, sensitivity, model_complexity)
         self._subscribers = set()
         self._lock = Lock()
         self._active = False
-        self._grab_thread = None
-        self._grab_stop_event = Event()
         self._cap = None
+        self._capture_thread = None
+        self._capture_stop_event = Event()
+        # Single-slot hand-off between the capture thread and the stream. Frames
+        # rotate through three buffers (ready, held by the stream, recycled) so
+        # the capture thread never writes into a frame that is being analysed.
+        self._frame_lock = Lock()
+        self._demand = Event()
+        self._frame_ready = Event()
+        self._ready_frame = None
+        self._held_frame = None
+        self._recycled_frame = None
+        # Reused destination for _downscale; only the stream touches it
+        self._small_frame = None
+        # Recent stage durations in nanoseconds, reported by stats()
+        self._capture_ns = deque(maxlen=STATS_WINDOW)
+        self._detect_ns = deque(maxlen=STATS_WINDOW)
+        self._dropped_frames = 0
+
+    def stats(self):
+        """
+        Summarize recent pipeline timings.
+
+        Returns:
+            dict: p50/p95 milliseconds for the "capture" (waiting for and downscaling
+            a frame) and "detect" (PostureDetector) stages over the last STATS_WINDOW
+            samples, the number of "samples" covered, and the total count of
+            "dropped" frames that were decoded but superseded before being analysed.
+        """
+        return {
+            "capture_ms": _percentiles_ms(self._capture_ns),
+            "detect_ms": _percentiles_ms(self._detect_ns),
+            "samples": len(self._detect_ns),
+            "dropped": self._dropped_frames,
+        }
+
+    @classmethod
+    def _get_detector(cls, camera_index, sensitivity, model_complexity):
+        """
+        Return a cached PostureDetector for the given camera and settings, creating it on first use.
+
+        Args:
+            camera_index (int): Index of the camera whose frames the detector tracks.
+            sensitivity (float): Sensitivity for posture detection.
+            model_complexity (int): MediaPipe pose model complexity.
+
+        Returns:
+            PostureDetector: The shared detector.
+        """
+        key = (camera_index, round(sensitivity, 3), model_complexity)
+        with cls._detector_cache_lock:
+            detector = cls._detector_cache.get(key)
+            if detector is None:
+                detector = PostureDetector(sensitivity=key[1], model_complexity=model_complexity)
+                cls._detector_cache[key] = detector
+        return detector
 
     def subscribe(self, subscriber_id=None):
         """
@@ -61,16 +187,18 @@ class CameraMonitor:
         """
         with self._lock:
             sid = subscriber_id or id(self)
+            # Open the camera once and keep it for the lifetime of the subscription
+            if self._cap is None:
+                self._cap = self._open_capture()
             self._subscribers.add(sid)
             self._active = True
-            if self._cap is None:
-                self._cap = cv2.VideoCapture(self.camera_index)
-                if not self._cap.isOpened():
-                    raise RuntimeError("Could not open camera.")
-            if self._grab_thread is None or not self._grab_thread.is_alive():
-                self._grab_stop_event.clear()
-                self._grab_thread = Thread(target=self._grabber, daemon=True)
-                self._grab_thread.start()
+            if self._capture_thread is None or not self._capture_thread.is_alive():
+                self._capture_stop_event.clear()
+                self._demand.clear()
+                self._frame_ready.clear()
+                self._ready_frame = None
+                self._capture_thread = Thread(target=self._capture_loop, args=(self._cap,), daemon=True)
+                self._capture_thread.start()
         return self._posture_stream(sid)
 
     def unsubscribe(self, subscriber_id=None):
@@ -85,16 +213,20 @@ class CameraMonitor:
                 self._subscribers.discard(subscriber_id)
             else:
                 self._subscribers.clear()
-            if not self._subscribers:
-                self._active = False
-                # Stop the grabber thread and release camera
-                self._grab_stop_event.set()
-                if self._grab_thread is not None:
-                    self._grab_thread.join(timeout=1)
-                    self._grab_thread = None
-                if self._cap is not None:
-                    self._cap.release()
-                    self._cap = None
+            if self._subscribers:
+                return
+            self._active = False
+            self._capture_stop_event.set()
+            self._demand.set()
+            # Wake a stream waiting for a frame; it finds no frame and stops
+            self._frame_ready.set()
+            capture_thread, self._capture_thread = self._capture_thread, None
+            cap, self._cap = self._cap, None
+        # Join and release outside the lock; both can block on the camera driver
+        if capture_thread is not None:
+            capture_thread.join(timeout=1)
+        if cap is not None:
+            cap.release()
 
     def _posture_stream(self, sid):
         """
@@ -109,30 +241,188 @@ class CameraMonitor:
         Raises:
             RuntimeError: If the camera cannot be opened or a frame cannot be captured.
         """
+        # Sleep until absolute deadlines so capture and detection time do not add drift
+        next_deadline = time.monotonic()
         while True:
             with self._lock:
                 if sid not in self._subscribers or self._cap is None:
                     break
-                cap = self._cap
             try:
-                if not cap.isOpened():
-                    raise RuntimeError("Could not open camera.")
-                ret, frame = cap.read()
-                if not ret:
-                    raise RuntimeError("Failed to capture image from camera.")
+                start = time.perf_counter_ns()
+                frame = self._downscale(self._take_frame())
+                captured = time.perf_counter_ns()
                 is_leaning = self.detector.is_leaning_forward(frame)
+                self._capture_ns.append(captured - start)
+                self._detect_ns.append(time.perf_counter_ns() - captured)
                 yield is_leaning
             except RuntimeError:
+                if self._capture_stop_event.is_set():
+                    break
                 yield None
             finally:
-                time.sleep(self.interval)
+                next_deadline += self.interval
+                sleep_s = next_deadline - time.monotonic()
+                if sleep_s > 0:
+                    # Waiting on the stop event lets unsubscribe() end the stream mid-interval
+                    self._capture_stop_event.wait(sleep_s)
+                else:
+                    # Fell behind (e.g. a slow consumer); resume from now instead of bursting
+                    next_deadline = time.monotonic()
 
-    def _grabber(self):
-        while not self._grab_stop_event.is_set():
-            with self._lock:
-                if self._cap is not None and self._cap.isOpened():
-                    self._cap.grab()
-            time.sleep(0.001)
+    def _open_capture(self):
+        """
+        Open the camera and configure it to hold only the most recent frame.
+
+        A GStreamer pipeline is preferred where available, since its appsink drops
+        stale frames even when the driver ignores CAP_PROP_BUFFERSIZE.
+
+        Returns:
+            cv2.VideoCapture: The opened capture device.
+
+        Raises:
+            RuntimeError: If the camera cannot be opened.
+        """
+        cap = self._open_gstreamer_capture()
+        if cap is not None:
+            return cap
+        cap = cv2.VideoCapture(self.camera_index)
+        if not cap.isOpened():
+            cap.release()
+            raise RuntimeError("Could not open camera.")
+        # Keep a single frame in the driver queue so reads are never seconds stale
+        if not cap.set(cv2.CAP_PROP_BUFFERSIZE, 1):
+            logger.warning("Camera backend ignored CAP_PROP_BUFFERSIZE; frames may be stale.")
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAPTURE_WIDTH)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, CAPTURE_HEIGHT)
+        return cap
+
+    def _open_gstreamer_capture(self):
+        """
+        Open the camera through GSTREAMER_PIPELINE.
+
+        Returns:
+            cv2.VideoCapture or None: The opened capture, or None if GStreamer is unavailable.
+        """
+        if not sys.platform.startswith("linux") or not cv2.videoio_registry.hasBackend(cv2.CAP_GSTREAMER):
+            return None
+        pipeline = GSTREAMER_PIPELINE.format(index=self.camera_index, width=CAPTURE_WIDTH, height=CAPTURE_HEIGHT)
+        cap = cv2.VideoCapture(pipeline, cv2.CAP_GSTREAMER)
+        if not cap.isOpened():
+            cap.release()
+            logger.info("GStreamer pipeline unavailable, falling back to the default camera backend.")
+            return None
+        return cap
+
+    def _capture_loop(self, cap):
+        """
+        Decode and publish the newest frame whenever the stream asks for one.
+
+        Between requests the thread sleeps on the demand event and does not touch
+        the camera; stale frames queued meanwhile are flushed by _read_latest.
+
+        Args:
+            cap (cv2.VideoCapture): The opened capture device.
+        """
+        buffer = self._allocate_frame(cap)
+        while not self._capture_stop_event.is_set():
+            self._demand.wait()
+            if self._capture_stop_event.is_set():
+                break
+            ret, frame = self._read_latest(cap, buffer)
+            if not ret:
+                buffer = None
+                self._capture_stop_event.wait(self.interval / 8)
+                continue
+            with self._frame_lock:
+                # An unconsumed frame is superseded; reuse its buffer for the next read
+                buffer, self._ready_frame = self._ready_frame, frame
+                if buffer is None:
+                    buffer, self._recycled_frame = self._recycled_frame, None
+                else:
+                    self._dropped_frames += 1
+                self._demand.clear()
+                self._frame_ready.set()
+
+    def _take_frame(self):
+        """
+        Ask the capture thread for a frame and wait until it is published.
+
+        Returns:
+            MatLike: The most recent camera frame (BGR).
+
+        Raises:
+            RuntimeError: If no frame arrives within FRAME_TIMEOUT_SECONDS or the
+                monitor is unsubscribed while waiting.
+        """
+        self._demand.set()
+        if not self._frame_ready.wait(FRAME_TIMEOUT_SECONDS):
+            raise RuntimeError("Failed to capture image from camera.")
+        with self._frame_lock:
+            frame, self._ready_frame = self._ready_frame, None
+            self._frame_ready.clear()
+            if frame is None:
+                raise RuntimeError("Camera monitor was unsubscribed.")
+            # The previously analysed frame can now be overwritten by the capture thread
+            self._recycled_frame, self._held_frame = self._held_frame, frame
+        return frame
+
+    def _downscale(self, frame):
+        """
+        Shrink a frame to DETECTION_WIDTH, keeping its aspect ratio.
+
+        Args:
+            frame (MatLike): The camera frame (BGR).
+
+        Returns:
+            MatLike: The downscaled frame, or the input if it is already small enough.
+        """
+        height, width = frame.shape[:2]
+        if width <= DETECTION_WIDTH:
+            return frame
+        size = (DETECTION_WIDTH, round(height * DETECTION_WIDTH / width))
+        self._small_frame = cv2.resize(frame, size, self._small_frame, interpolation=cv2.INTER_AREA)
+        return self._small_frame
+
+    @staticmethod
+    def _allocate_frame(cap):
+        """
+        Preallocate a frame buffer matching the capture's negotiated resolution.
+
+        Args:
+            cap (cv2.VideoCapture): The opened capture device.
+
+        Returns:
+            numpy.ndarray or None: An empty BGR frame, or None if the resolution is unknown.
+        """
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        if width <= 0 or height <= 0:
+            return None
+        return np.empty((height, width, 3), dtype=np.uint8)
+
+    def _read_latest(self, cap, buffer=None):
+        """
+        Discard frames queued by the driver and decode the newest one.
+
+        Grabbing stops early once a grab has to wait for the sensor, since that
+        frame was captured after the call and the queue is known to be empty. A
+        full queue takes one extra grab, because a driver with no free buffers
+        stops capturing and every queued frame predates the request.
+
+        Args:
+            cap (cv2.VideoCapture): The opened capture device.
+            buffer (numpy.ndarray, optional): Array to decode into, reused when its shape matches.
+
+        Returns:
+            tuple: (ret, frame) as returned by cv2.VideoCapture.retrieve.
+        """
+        for _ in range(MAX_BUFFERED_FRAMES + 1):
+            start = time.perf_counter()
+            if not cap.grab():
+                return False, None
+            if time.perf_counter() - start > FRESH_GRAB_SECONDS:
+                break
+        return cap.retrieve(buffer)
 
 
 if __name__ == "__main__":
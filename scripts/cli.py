@@ -7,10 +7,21 @@ This CLI acts as a server that continuously monitors posture through a camera
 and streams the results as JSON lines over stdout. It's designed to be used
 as a long-running process that can be managed by parent processes (e.g., Flutter apps).
 
+Camera capture and posture detection run in a child process that hands samples
+to this process through a small bounded queue, so a slow stdout reader never
+delays the camera: once the queue is full the oldest sample the CLI has not
+picked up yet is dropped in favour of the newest one.
+
+Start the CLI with the virtual environment's interpreter (venv/bin/python or
+venv\Scripts\python.exe, created by the venv_setup scripts). Importing this
+module does no environment bootstrapping and never re-executes the process.
+It loads neither OpenCV nor MediaPipe, which only the worker process imports,
+so they are loaded once per run whichever multiprocessing start method is used.
+
 JSON Output Format:
     Posture Results:
         {
-            "timestamp": float,      # Unix timestamp
+            "timestamp": int,        # Nanoseconds since the Unix epoch
             "type": "posture",       # Message type
             "code": 0,               # Success = 0
             "is_leaning": bool,      # True if leaning detected
@@ -19,20 +30,39 @@ JSON Output Format:
 
     Status Messages:
         {
-            "timestamp": float,      # Unix timestamp
+            "timestamp": int,        # Nanoseconds since the Unix epoch
             "type": "status",        # Message type
             "code": int,             # Status code (0 = OK)
             "message": str          # Status description
         }
+        Sent when monitoring starts and when it stops on request.
 
     Error Messages:
         {
-            "timestamp": float,      # Unix timestamp
+            "timestamp": int,        # Nanoseconds since the Unix epoch
             "type": "error",         # Message type
             "code": int,             # Error code (see below)
             "message": str          # Error description
         }
 
+    Metrics Messages (every METRICS_EVERY posture samples):
+        {
+            "timestamp": int,        # Nanoseconds since the Unix epoch
+            "type": "metrics",       # Message type
+            "code": 0,               # Success = 0
+            "capture_ms": {"p50": float, "p95": float},  # Frame wait + downscale
+            "detect_ms": {"p50": float, "p95": float},   # Posture detection
+            "samples": int,          # Samples covered by the percentiles
+            "dropped": int,          # Frames decoded but superseded before analysis
+            "dropped_messages": int # Output records discarded because stdout was not being read
+        }
+
+MessagePack Output Format (--format msgpack):
+    Each record is a 4-byte little-endian unsigned length followed by that many
+    bytes of MessagePack. Posture results are packed as a compact array
+    [timestamp, is_leaning]; every other message is a map with the same fields
+    as its JSON form above, so consumers can tell them apart by type.
+
 Error Codes:
     1: General error
     2: Camera subscription error
@@ -42,22 +72,155 @@ Error Codes:
 
 Usage:
     python cli.py [--interval SECONDS] [--camera INDEX]
-                 [--sensitivity FLOAT]
+                 [--sensitivity FLOAT] [--model-complexity {0,1,2}]
+                 [--format {json,msgpack}] [--verbose]
 
 Example:
     python cli.py --interval 2.0 --sensitivity 0.4 --camera
 """
 
+import os
 import sys
 import json
 import time
+import atexit
+import queue
+import struct
 import signal
+import logging
 import argparse
+import threading
+import multiprocessing
 
 from typing import Dict, Any
+from collections import deque
 from contextlib import contextmanager
 
-from camera_monitor import CameraMonitor
+# Samples the worker may queue ahead of the CLI before the oldest are dropped
+SAMPLE_QUEUE_SIZE = 4
+# Pipeline metrics are reported once per this many posture samples
+METRICS_EVERY = 30
+# How often the output loop wakes to check for shutdown while waiting for samples
+WORKER_POLL_SECONDS = 0.5
+# Grace period for the worker to stop on its own before it is terminated
+WORKER_JOIN_SECONDS = 2.0
+# Buffered stdout is written out once it holds this many bytes...
+FLUSH_BYTES = 65536
+# ...or when this much time has passed since the last write
+FLUSH_INTERVAL_SECONDS = 0.05
+# Pending output beyond this while stdout is blocked is discarded, whole records at a time
+MAX_PENDING_BYTES = 4 * FLUSH_BYTES
+
+OUTPUT_FORMATS = ("json", "msgpack")
+# Everything after the timestamp in a JSON posture line only depends on is_leaning
+_POSTURE_JSON_TAILS = {
+    True: b',"type":"posture","code":0,"is_leaning":true,"posture":"leaning"}\n',
+    False: b',"type":"posture","code":0,"is_leaning":false,"posture":"upright"}\n',
+}
+# Start of status and error lines; only the timestamp, code and message vary
+_EVENT_JSON_HEADS = {
+    "status": b'{"timestamp":%d,"type":"status","code":%d,"message":',
+    "error": b'{"timestamp":%d,"type":"error","code":%d,"message":',
+}
+# Length prefix of each record in msgpack output
+_FRAME_HEADER = struct.Struct("<I")
+
+try:
+    import orjson
+
+    _dumps = orjson.dumps
+
+    def _dumps_line(data: Dict[str, Any]) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_APPEND_NEWLINE)
+
+except ImportError:
+    # Reused for every message instead of rebuilding encoder options per call
+    _json_encoder = json.JSONEncoder(separators=(",", ":"))
+
+    def _dumps(data: Any) -> bytes:
+        return _json_encoder.encode(data).encode()
+
+    def _dumps_line(data: Dict[str, Any]) -> bytes:
+        return (_json_encoder.encode(data) + "\n").encode()
+
+
+try:
+    import msgpack
+except ImportError:
+    # Only needed for --format msgpack, which parse_args rejects without it
+    msgpack = None
+
+
+def _configure_logging(verbose: bool):
+    """Send log records to stderr, keeping stdout for the JSON stream."""
+    logging.basicConfig(
+        stream=sys.stderr,
+        level=logging.DEBUG if verbose else logging.WARNING,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+
+
+def _put_latest(samples, message):
+    """Queue a message without blocking, discarding the oldest queued one if full."""
+    try:
+        samples.put_nowait(message)
+    except queue.Full:
+        try:
+            samples.get_nowait()
+            samples.put_nowait(message)
+        except (queue.Empty, queue.Full):
+            # The CLI drained or refilled the queue meanwhile; skip this message
+            pass
+
+
+def _unsubscribe_on_stop(stop_event, monitor):
+    """Wait for the CLI to request shutdown, then end the monitor's stream."""
+    stop_event.wait()
+    monitor.unsubscribe()
+
+
+def _monitor_worker(samples, stop_event, monitor_options: Dict[str, Any], verbose: bool):
+    """
+    Child process entry point: run the camera monitor and forward its samples.
+
+    Messages are (kind, timestamp, payload) tuples. "posture" carries the leaning
+    state (None if detection failed) and "metrics" carries CameraMonitor.stats();
+    both replace the oldest queued message when the queue is full. "started" is
+    sent once the camera is open, with no payload. "error" carries (code, message)
+    and is sent once before the worker exits.
+
+    Args:
+        samples: multiprocessing.Queue shared with the CLI process
+        stop_event: multiprocessing.Event set by the CLI to request shutdown
+        monitor_options: Keyword arguments for CameraMonitor
+        verbose: Whether to log debug information to stderr
+    """
+    # Shutdown is coordinated by the CLI process through stop_event
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    _configure_logging(verbose)
+
+    monitor = None
+    try:
+        # Imported here so the CLI process, which only ships output, never loads MediaPipe
+        from camera_monitor import CameraMonitor
+
+        monitor = CameraMonitor(**monitor_options)
+        stream = monitor.subscribe()
+        samples.put(("started", time.time_ns(), None))
+        # Unsubscribing ends the stream at once, even mid-interval, so the loop needs no stop check
+        threading.Thread(target=_unsubscribe_on_stop, args=(stop_event, monitor), daemon=True).start()
+        for count, is_leaning in enumerate(stream, start=1):
+            _put_latest(samples, ("posture", time.time_ns(), is_leaning))
+            if count % METRICS_EVERY == 0:
+                _put_latest(samples, ("metrics", time.time_ns(), monitor.stats()))
+    except RuntimeError as e:
+        samples.put(("error", time.time_ns(), (10, f"Camera hardware error: {str(e)}")))
+    except Exception as e:
+        samples.put(("error", time.time_ns(), (99, f"Unexpected error: {str(e)}")))
+    finally:
+        if monitor is not None:
+            monitor.unsubscribe()
 
 
 class PostureStreamCLI:
@@ -75,7 +238,15 @@ class PostureStreamCLI:
     4. Detailed Logging: Comprehensive logging for debugging
     """
 
-    def __init__(self, interval: float, camera_index: int, sensitivity: float):
+    def __init__(
+        self,
+        interval: float,
+        camera_index: int,
+        sensitivity: float,
+        model_complexity: int = 1,
+        output_format: str = "json",
+        verbose: bool = False,
+    ):
         """
         Initialize the streaming CLI with monitoring parameters.
 
@@ -83,14 +254,55 @@ class PostureStreamCLI:
             interval: Seconds between posture checks
             camera_index: Index of the camera device to use
             sensitivity: Posture detection sensitivity (0.0-1.0)
+            model_complexity: MediaPipe pose model, 0 (lite), 1 (full) or 2 (heavy)
+            output_format: "json" for JSON lines or "msgpack" for length-prefixed MessagePack
+            verbose: Whether to log debug information to stderr
         """
-        self.monitor = CameraMonitor(interval=interval, camera_index=camera_index, sensitivity=sensitivity)
-        self.running = True
-        self.subscriber_id = id(self)
+        self._setup_logging(verbose)
+        self.interval = interval
+        self._stop = threading.Event()
+        self.output_format = output_format
+        self._write_message = self._write_msgpack if output_format == "msgpack" else self._write_json
+        self._stdout_fd = sys.stdout.fileno()
+        # Interactive terminals get every line immediately; pipes are block-buffered
+        self._is_tty = os.isatty(self._stdout_fd)
+        self._out_buffer = bytearray()
+        self._append_output = self._out_buffer.extend
+        self._last_flush = time.monotonic()
+        # Sizes of the records in _out_buffer, oldest first, and how much of the
+        # oldest one has already been written
+        self._record_sizes = deque()
+        self._head_written = 0
+        self.dropped_messages = 0
+        self._stdout_nonblocking = self._set_stdout_blocking(False)
+        # Exits that bypass run() still get their buffered output written
+        atexit.register(self._flush_output)
+        self._samples = multiprocessing.Queue(maxsize=SAMPLE_QUEUE_SIZE)
+        self._worker_stop = multiprocessing.Event()
+        monitor_options = {
+            "interval": interval,
+            "camera_index": camera_index,
+            "sensitivity": sensitivity,
+            "model_complexity": model_complexity,
+        }
+        self._worker = multiprocessing.Process(
+            target=_monitor_worker,
+            args=(self._samples, self._worker_stop, monitor_options, verbose),
+            daemon=True,
+        )
 
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
 
+    def _setup_logging(self, verbose: bool):
+        """Configure stderr logging for this process and bind the CLI logger."""
+        _configure_logging(verbose)
+        self.logger = logging.getLogger("posture_cli")
+        self._log_info = self.logger.info
+        self._log_debug = self.logger.debug
+        # The level is fixed for the life of the process, so check it once
+        self._debug_on = self.logger.isEnabledFor(logging.DEBUG)
+
     def run(self) -> int:
         """
         Main execution loop that streams posture detection results.
@@ -103,26 +315,42 @@ class PostureStreamCLI:
         """
         try:
             with self._error_context("camera monitor subscription", code=2):
-                stream = self.monitor.subscribe(self.subscriber_id)
-
-            while self.running:
+                self._worker.start()
+            if self._worker.pid is None:
+                return 1
+            self._log_debug("Camera monitor process started (pid %d)", self._worker.pid)
+
+            while not self._stop.is_set():
+                # Wake up in time to flush pending output when the stream goes quiet
+                timeout = FLUSH_INTERVAL_SECONDS if self._out_buffer else WORKER_POLL_SECONDS
                 try:
-                    is_leaning = next(stream)
-                    if is_leaning is None:
-                        raise RuntimeError("Posture detection failed, no result returned")
-                    timestamp = time.time()
-                    self._output_posture(is_leaning, timestamp)
-                except StopIteration:
-                    break
-                except Exception as e:
-                    # Catch all errors from camera_monitor or posture_detector
-                    self._output_error(f"Posture detection error: {e}", code=3)
-                    time.sleep(self.monitor.interval)
+                    kind, timestamp, payload = self._samples.get(timeout=timeout)
+                except queue.Empty:
+                    self._flush_output()
+                    if not self._worker.is_alive() and not self._stop.is_set():
+                        self._output_error("Camera monitor process exited unexpectedly", code=2)
+                        return 1
+                    continue
+                if kind == "error":
+                    code, message = payload
+                    self._output_error(message, code=code)
+                    return 1
+                if kind == "started":
+                    self._output_status("Posture monitoring started")
+                    continue
+                if kind == "metrics":
+                    self._output_metrics(payload, timestamp)
+                    continue
+                if payload is None:
+                    self._output_error("Posture detection error: Posture detection failed, no result returned", code=3)
+                    continue
+                if self._debug_on:
+                    self._log_debug("Posture detected: %s", "leaning" if payload else "upright")
+                self._output_posture(payload, timestamp)
+            self._log_info("Shutting down")
+            self._output_status("Posture monitoring stopped")
             return 0
 
-        except RuntimeError as e:
-            self._output_error(f"Camera hardware error: {str(e)}", code=10)
-            return 1
         except Exception as e:
             self._output_error(f"Unexpected error: {str(e)}", code=99)
             return 1
@@ -131,14 +359,32 @@ class PostureStreamCLI:
 
     def _cleanup(self):
         """Perform cleanup operations before shutdown."""
+        self._flush_output()
+        # Whatever a stalled reader left pending is dropped; a blocking write here
+        # (or from the atexit hook) would keep the process from ever exiting
+        atexit.unregister(self._flush_output)
+        if self._out_buffer:
+            self.dropped_messages += len(self._record_sizes)
+            self._out_buffer.clear()
+            self._record_sizes.clear()
+            self._head_written = 0
+        if self._stdout_nonblocking:
+            self._set_stdout_blocking(True)
         try:
-            self.monitor.unsubscribe(self.subscriber_id)
+            self._worker_stop.set()
+            if self._worker.pid is not None:
+                self._worker.join(timeout=WORKER_JOIN_SECONDS)
+                if self._worker.is_alive():
+                    self._worker.terminate()
+                    self._worker.join()
         except Exception:
             pass
 
     def _signal_handler(self, signum: int, frame=None):
         """Handle shutdown signals gracefully."""
-        self.running = False
+        self._stop.set()
+        # Let the worker release the camera while this process drains its output
+        self._worker_stop.set()
 
     @contextmanager
     def _error_context(self, operation: str, code: int = 1):
@@ -153,40 +399,158 @@ class PostureStreamCLI:
         try:
             yield
         except KeyboardInterrupt:
-            self.running = False
+            self._stop.set()
         except Exception as e:
             error_msg = f"Error during {operation}: {str(e)}"
             self._output_error(error_msg, code=code)
 
     def _write_json(self, data: Dict[str, Any]):
         """
-        Write JSON data to stdout with proper flushing.
+        Buffer JSON data for stdout as one line.
 
         Args:
             data: Dictionary to serialize as JSON
         """
+        line = _dumps_line(data)
+        self._append_output(line)
+        self._end_record(len(line))
+
+    def _write_msgpack(self, data: Any):
+        """
+        Buffer data for stdout as one length-prefixed MessagePack record.
+
+        Args:
+            data: Object to serialize with MessagePack
+        """
+        payload = msgpack.packb(data)
+        self._append_output(_FRAME_HEADER.pack(len(payload)))
+        self._append_output(payload)
+        self._end_record(_FRAME_HEADER.size + len(payload))
+
+    def _end_record(self, size: int):
+        """
+        Register a record that was just buffered and flush if it is due.
+
+        On a terminal every record is flushed right away. Otherwise output is
+        flushed by size or age, and run() flushes whenever the stream goes idle.
+
+        Args:
+            size: Size of the record in bytes
+        """
+        self._record_sizes.append(size)
+        if (
+            self._is_tty
+            or len(self._out_buffer) >= FLUSH_BYTES
+            or time.monotonic() - self._last_flush >= FLUSH_INTERVAL_SECONDS
+        ):
+            self._flush_output()
+
+    def _flush_output(self):
+        """
+        Write buffered output to stdout without waiting on a stalled reader.
+
+        Whatever cannot be written stays buffered for the next flush; once more
+        than MAX_PENDING_BYTES are pending the complete records are discarded and
+        counted in dropped_messages.
+        """
         try:
-            sys.stdout.write(json.dumps(data, separators=(",", ":")) + "\n")
-            sys.stdout.flush()
+            while self._out_buffer:
+                written = os.write(self._stdout_fd, self._out_buffer)
+                del self._out_buffer[:written]
+                self._head_written += written
+                while self._record_sizes and self._head_written >= self._record_sizes[0]:
+                    self._head_written -= self._record_sizes.popleft()
+        except BlockingIOError:
+            if len(self._out_buffer) > MAX_PENDING_BYTES:
+                # Keep the rest of a partially written record so the stream stays aligned
+                keep = self._record_sizes[0] - self._head_written if self._head_written else 0
+                self.dropped_messages += len(self._record_sizes) - (1 if keep else 0)
+                del self._out_buffer[keep:]
+                if keep:
+                    head = self._record_sizes[0]
+                    self._record_sizes.clear()
+                    self._record_sizes.append(head)
+                else:
+                    self._record_sizes.clear()
         except (IOError, OSError):
-            self.running = False
+            self._out_buffer.clear()
+            self._record_sizes.clear()
+            self._head_written = 0
+            self._stop.set()
+        self._last_flush = time.monotonic()
+
+    def _set_stdout_blocking(self, blocking: bool) -> bool:
+        """
+        Switch stdout between blocking and non-blocking mode.
+
+        Terminals are left alone, since the mode is shared with the parent shell.
+
+        Args:
+            blocking: Desired mode
+
+        Returns:
+            bool: True if the mode was changed
+        """
+        if self._is_tty:
+            return False
+        try:
+            os.set_blocking(self._stdout_fd, blocking)
+        except (AttributeError, OSError):
+            # os.set_blocking is unavailable for pipes on older Windows Pythons
+            return False
+        return True
+
+    def _output_event(self, kind: str, message: str, code: int):
+        """
+        Output a status or error message stamped with the current time.
+
+        Args:
+            kind: "status" or "error"
+            message: Human-readable description
+            code: Status or error code
+        """
+        timestamp = time.time_ns()
+        if self.output_format == "msgpack":
+            self._write_msgpack({"timestamp": timestamp, "type": kind, "code": code, "message": message})
+            return
+        head = _EVENT_JSON_HEADS[kind] % (timestamp, code)
+        body = _dumps(message)
+        self._append_output(head)
+        self._append_output(body)
+        self._append_output(b"}\n")
+        self._end_record(len(head) + len(body) + 2)
+
+    def _output_status(self, message: str, code: int = 0):
+        """Output status message."""
+        self._output_event("status", message, code)
 
     def _output_error(self, message: str, code: int = 1):
-        """Output error message as JSON."""
-        self._write_json({"timestamp": time.time(), "type": "error", "code": code, "message": message})
+        """Output error message."""
+        self._output_event("error", message, code)
 
-    def _output_posture(self, is_leaning: bool, timestamp: float):
-        """Output posture detection result as JSON."""
-        self._write_json(
+    def _output_metrics(self, stats: Dict[str, Any], timestamp: int):
+        """Output pipeline metrics."""
+        self._write_message(
             {
                 "timestamp": timestamp,
-                "type": "posture",
+                "type": "metrics",
                 "code": 0,
-                "is_leaning": is_leaning,
-                "posture": "leaning" if is_leaning else "upright",
+                **stats,
+                "dropped_messages": self.dropped_messages,
             }
         )
 
+    def _output_posture(self, is_leaning: bool, timestamp: int):
+        """Output posture detection result."""
+        if self.output_format == "msgpack":
+            self._write_msgpack((timestamp, is_leaning))
+            return
+        head = b'{"timestamp":%d' % timestamp
+        tail = _POSTURE_JSON_TAILS[bool(is_leaning)]
+        self._append_output(head)
+        self._append_output(tail)
+        self._end_record(len(head) + len(tail))
+
 
 def parse_args() -> argparse.Namespace:
     """Parse and validate command-line arguments."""
@@ -217,6 +581,25 @@ Examples:
         metavar="FLOAT",
         help="Posture detection sensitivity 0.0-1.0 (default: 0.4)",
     )
+    parser.add_argument(
+        "--model-complexity",
+        "-m",
+        type=int,
+        choices=(0, 1, 2),
+        default=1,
+        help="Pose model: 0 = lite (fastest), 1 = full, 2 = heavy (default: 1)",
+    )
+    parser.add_argument(
+        "--format",
+        "-f",
+        dest="output_format",
+        choices=OUTPUT_FORMATS,
+        default="json",
+        help="Output encoding: JSON lines or length-prefixed MessagePack (default: json)",
+    )
+    parser.add_argument(
+        "--verbose", "-v", action="store_true", help="Log debug information (e.g. OpenCV build) to stderr"
+    )
 
     args = parser.parse_args()
 
@@ -227,6 +610,8 @@ Examples:
         parser.error("--camera must be non-negative")
     if not (0.0 <= args.sensitivity <= 1.0):
         parser.error("--sensitivity must be between 0.0 and 1.0")
+    if args.output_format == "msgpack" and msgpack is None:
+        parser.error("--format msgpack requires the msgpack package")
 
     return args
 
@@ -243,6 +628,9 @@ def main() -> int:
         interval=args.interval,
         camera_index=args.camera,
         sensitivity=args.sensitivity,
+        model_complexity=args.model_complexity,
+        output_format=args.output_format,
+        verbose=args.verbose,
     )
     return cli.run()
 
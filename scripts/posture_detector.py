@@ -13,18 +13,53 @@ Usage Example:
 """
 
 import cv2
+import numpy as np
 import mediapipe as mp
+from threading import Lock
+from concurrent.futures import ThreadPoolExecutor
 from cv2.typing import MatLike
 
+try:
+    from numba import njit
+except ImportError:
+    # numba is optional; without it the helpers below run as plain Python
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True, fastmath=True)
+def _upper_shoulder_y(shoulder_y, ear_y, sensitivity):
+    """Move a normalized shoulder y toward the ear by the sensitivity fraction."""
+    return sensitivity * (ear_y - shoulder_y) + shoulder_y
+
+
+@njit(cache=True, fastmath=True)
+def _pick_shoulder(left_x, left_y, right_x, right_y, left_ear_y, right_ear_y, sensitivity, width, height):
+    """Return the pixel (x, y) of the higher sensitivity-adjusted shoulder; ties pick the right side."""
+    upper_left_y = int(_upper_shoulder_y(left_y, left_ear_y, sensitivity) * height)
+    upper_right_y = int(_upper_shoulder_y(right_y, right_ear_y, sensitivity) * height)
+    if upper_left_y < upper_right_y:
+        return int(left_x * width), upper_left_y
+    return int(right_x * width), upper_right_y
+
 
 class PostureDetector:
-    def __init__(self, sensitivity=0.4):
+    _pool = None
+
+    def __init__(self, sensitivity=0.4, model_complexity=1):
         """
         Initialize the PostureDetector.
 
         Args:
             sensitivity (float): Sensitivity for posture detection (default is 0.4).
+            model_complexity (int): MediaPipe pose model, 0 (lite), 1 (full) or 2 (heavy) (default is 1).
         """
+        # Serializes is_leaning_forward for monitors sharing this detector
+        self._lock = Lock()
+        # RGB copy of the current frame, reused while the frame shape stays the same
+        self._rgb_buf = None
         # Initialize MediaPipe solutions
         self.mp_pose = mp.solutions.pose
         self.mp_face_mesh = mp.solutions.face_mesh
@@ -35,16 +70,17 @@ class PostureDetector:
         # Initialize pose and face mesh
         self.pose = self.mp_pose.Pose(
             static_image_mode=False,
-            model_complexity=2,
+            model_complexity=model_complexity,
             enable_segmentation=False,
             min_detection_confidence=0.5,
             min_tracking_confidence=0.5,
         )
 
+        # Only the chin (landmark 175) is read, so the iris/lip refinement model is skipped
         self.face_mesh = self.mp_face_mesh.FaceMesh(
             static_image_mode=False,
             max_num_faces=1,
-            refine_landmarks=True,
+            refine_landmarks=False,
             min_detection_confidence=0.5,
             min_tracking_confidence=0.5,
         )
@@ -52,6 +88,26 @@ class PostureDetector:
         # Chin landmark index in MediaPipe face mesh (bottom of chin)
         self.CHIN_INDEX = 175
 
+        # Pose landmark indices, resolved once instead of per frame
+        pose_landmark = self.mp_pose.PoseLandmark
+        self.LEFT_SHOULDER_INDEX = pose_landmark.LEFT_SHOULDER.value
+        self.RIGHT_SHOULDER_INDEX = pose_landmark.RIGHT_SHOULDER.value
+        self.LEFT_EAR_INDEX = pose_landmark.LEFT_EAR.value
+        self.RIGHT_EAR_INDEX = pose_landmark.RIGHT_EAR.value
+
+        # Face mesh runs here while pose runs on the calling thread; MediaPipe
+        # releases the GIL during inference, so the two graphs overlap
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="face_mesh")
+
+    def close(self):
+        """Shut down the thread used to run face mesh alongside pose."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+    def __del__(self):
+        self.close()
+
     def is_leaning_forward(self, cv_frame: MatLike):
         """
         Check if the person in the frame is leaning forward by comparing chin and shoulder heights.
@@ -65,27 +121,56 @@ class PostureDetector:
         Raises:
             RuntimeError: If chin or shoulder position cannot be detected.
         """
-        image_rgb = cv2.cvtColor(cv_frame, cv2.COLOR_BGR2RGB)
-        image_shape = cv_frame.shape
+        # Buffers, the face mesh pool and the tracking graphs all belong to one frame at a time
+        with self._lock:
+            image_shape = cv_frame.shape
+            # MediaPipe copies non-contiguous input in each graph; one SIMD cvtColor
+            # into the reused buffer is far cheaper than handing it a [..., ::-1] view
+            pose_results, face_results = self._process(self._to_rgb(cv_frame))
+
+            chin_pos = None
+            if face_results.multi_face_landmarks:
+                chin_pos = self._get_chin_position(face_results.multi_face_landmarks[0], image_shape)
+
+            shoulder_pos = None
+            if pose_results.pose_landmarks:
+                shoulder_pos = self._get_shoulder_positions(pose_results.pose_landmarks, image_shape)
+
+            if chin_pos and shoulder_pos:
+                chin_y = chin_pos[1]
+                shoulder_y = shoulder_pos[1]
+                if chin_y > shoulder_y:
+                    return True
+                return False
+            return None
+
+    def _to_rgb(self, cv_frame: MatLike):
+        """
+        Convert a BGR frame to RGB in a buffer reused across frames.
 
-        pose_results = self.pose.process(image_rgb)
-        face_results = self.face_mesh.process(image_rgb)
+        Args:
+            cv_frame (MatLike): The image frame (BGR).
 
-        chin_pos = None
-        if face_results.multi_face_landmarks:
-            chin_pos = self._get_chin_position(face_results.multi_face_landmarks[0], image_shape)
+        Returns:
+            MatLike: The RGB frame, backed by self._rgb_buf.
+        """
+        if self._rgb_buf is None or self._rgb_buf.shape != cv_frame.shape:
+            self._rgb_buf = np.empty_like(cv_frame)
+        return cv2.cvtColor(cv_frame, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
 
-        shoulder_pos = None
-        if pose_results.pose_landmarks:
-            shoulder_pos = self._get_shoulder_positions(pose_results.pose_landmarks, image_shape)
+    def _process(self, image_rgb):
+        """
+        Run face mesh and pose on the same RGB frame, face mesh on the pool thread.
 
-        if chin_pos and shoulder_pos:
-            chin_y = chin_pos[1]
-            shoulder_y = shoulder_pos[1]
-            if chin_y > shoulder_y:
-                return True
-            return False
-        return None
+        Args:
+            image_rgb (MatLike): The image frame (RGB).
+
+        Returns:
+            tuple: (pose_results, face_results) from MediaPipe.
+        """
+        face_future = self._pool.submit(self.face_mesh.process, image_rgb)
+        pose_results = self.pose.process(image_rgb)
+        return pose_results, face_future.result()
 
     def _get_chin_position(self, face_landmarks, image_shape):
         """
@@ -123,20 +208,18 @@ class PostureDetector:
             RuntimeError: If no pose landmarks are detected.
         """
         if pose_landmarks:
-            left_shoulder = pose_landmarks.landmark[self.mp_pose.PoseLandmark.LEFT_SHOULDER]
-            right_shoulder = pose_landmarks.landmark[self.mp_pose.PoseLandmark.RIGHT_SHOULDER]
-            left_ear = pose_landmarks.landmark[self.mp_pose.PoseLandmark.LEFT_EAR]
-            right_ear = pose_landmarks.landmark[self.mp_pose.PoseLandmark.RIGHT_EAR]
-            left_upper_shoulder_x = int(left_shoulder.x * image_shape[1])
-            left_upper_shoulder_y = int(
-                (self.sensitivity * (left_ear.y - left_shoulder.y) + left_shoulder.y) * image_shape[0]
-            )
-            right_upper_shoulder_x = int(right_shoulder.x * image_shape[1])
-            right_upper_shoulder_y = int(
-                (self.sensitivity * (right_ear.y - right_shoulder.y) + right_shoulder.y) * image_shape[0]
+            landmark = pose_landmarks.landmark
+            left_shoulder = landmark[self.LEFT_SHOULDER_INDEX]
+            right_shoulder = landmark[self.RIGHT_SHOULDER_INDEX]
+            return _pick_shoulder(
+                left_shoulder.x,
+                left_shoulder.y,
+                right_shoulder.x,
+                right_shoulder.y,
+                landmark[self.LEFT_EAR_INDEX].y,
+                landmark[self.RIGHT_EAR_INDEX].y,
+                self.sensitivity,
+                image_shape[1],
+                image_shape[0],
             )
-            if left_upper_shoulder_y < right_upper_shoulder_y:
-                return left_upper_shoulder_x, left_upper_shoulder_y
-            else:
-                return right_upper_shoulder_x, right_upper_shoulder_y
         raise RuntimeError("No pose landmarks detected for shoulder position.")
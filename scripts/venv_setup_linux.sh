@@ -3,21 +3,33 @@
 # Exit immediately if a command exits with a non-zero status.
 set -e
 
+PIP_FLAGS="--disable-pip-version-check --no-input -q"
+REQ_HASH_FILE="venv/.req.sha256"
+
 # Create virtual environment in ./venv if it does not exist
 if [ ! -d "venv" ]; then
     python3 -m venv venv
 fi
 
+if [ ! -f "requirements.txt" ]; then
+    echo "requirements.txt not found!"
+    exit 1
+fi
+
+# Skip pip entirely when requirements.txt is unchanged since the last install
+REQ_HASH=$(sha256sum requirements.txt | cut -d ' ' -f 1)
+if [ -f "$REQ_HASH_FILE" ] && [ "$(cat "$REQ_HASH_FILE")" = "$REQ_HASH" ]; then
+    exit 0
+fi
+
 # Activate the virtual environment
 source venv/bin/activate
 
 # Upgrade pip
-pip install --upgrade pip
+pip install $PIP_FLAGS --upgrade pip
 
 # Install requirements
-if [ -f "requirements.txt" ]; then
-    pip install -r requirements.txt
-else
-    echo "requirements.txt not found!"
-    exit 1
-fi
+pip install $PIP_FLAGS -r requirements.txt
+
+# Only record the hash once the install succeeded
+echo "$REQ_HASH" > "$REQ_HASH_FILE"
@@ -1,19 +1,38 @@
 @echo off
+setlocal enabledelayedexpansion
+
+set PIP_FLAGS=--disable-pip-version-check --no-input -q
+set REQ_HASH_FILE=venv\.req.sha256
+
 REM Create virtual environment in .\venv if it does not exist
 if not exist venv (
     python -m venv venv
 )
 
+if not exist requirements.txt (
+    echo requirements.txt not found!
+    exit /b 1
+)
+
+REM Skip pip entirely when requirements.txt is unchanged since the last install
+set REQ_HASH=
+for /f "skip=1 delims=" %%H in ('certutil -hashfile requirements.txt SHA256') do (
+    if not defined REQ_HASH set REQ_HASH=%%H
+)
+set REQ_HASH=!REQ_HASH: =!
+if exist %REQ_HASH_FILE% (
+    set /p OLD_HASH=<%REQ_HASH_FILE%
+    if "!OLD_HASH!"=="!REQ_HASH!" exit /b 0
+)
+
 REM Activate the virtual environment
 call venv\Scripts\activate.bat
 
 REM Upgrade pip
-python -m pip install --upgrade pip
+python -m pip install %PIP_FLAGS% --upgrade pip || exit /b 1
 
 REM Install requirements
-if exist requirements.txt (
-    pip install -r requirements.txt
-) else (
-    echo requirements.txt not found!
-    exit /b 1
-)
+pip install %PIP_FLAGS% -r requirements.txt || exit /b 1
+
+REM Only record the hash once the install succeeded
+>%REQ_HASH_FILE% echo !REQ_HASH!